@@ -1,26 +1,118 @@
-from http.server import BaseHTTPRequestHandler, HTTPServer
-import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+from urllib.parse import parse_qs
+
+import orjson
 
 from api.auth import is_authenticated
+from api.storage import storage
 
 HOST = "localhost"
 PORT = 8000
 
-# temp in-memory storage (will later be replaced)
-transactions = []
+# bodies larger than this are written after the headers instead of being
+# copied onto them, so a big GET /transactions isn't duplicated in memory
+_COALESCE_LIMIT = 64 * 1024
+
+# the only routes: /transactions and /transactions/<id>
+_COLLECTION_PATH = "/transactions"
+_ITEM_PREFIX = "/transactions/"
+
+# every error body the API sends is fixed, so serialize each one up front;
+# indexed by _pretty to get the compact or the indented form
+_ERROR_BLOBS = {
+    message: (
+        orjson.dumps({"error": message}),
+        orjson.dumps({"error": message}, option=orjson.OPT_INDENT_2),
+    )
+    for message in ("Endpoint not found", "Transaction not found", "Invalid ID", "Invalid JSON", "Invalid limit")
+}
+
+_DELETED_BLOBS = (
+    orjson.dumps({"message": "Transaction deleted"}),
+    orjson.dumps({"message": "Transaction deleted"}, option=orjson.OPT_INDENT_2),
+)
+
+# requests run on their own threads; writes to the storage and the
+# response cache happen under this lock
+_lock = threading.Lock()
 
 class TransactionHandler(BaseHTTPRequestHandler):
-    def _send_response(self, status, data=None):
-        self.send_response(status)
-        self.send_header("Content-Type", "application/json")
-        self.end_headers()
-        if data is not None:
-            self.wfile.write(json.dumps(data).encode())
+    # keep-alive, so a client can send many requests over one connection
+    protocol_version = "HTTP/1.1"
+
+    # serialized GET /transactions body, rebuilt on the first read after a change
+    _all_cache = None
+    # serialized body of each transaction by ID, so reads don't re-serialize
+    _json_by_id = {}
+
+    def parse_request(self):
+        self._body_read = False
+        self._pretty = False
+        self._params = {}
+        return super().parse_request()
+
+    def _read_body(self):
+        content_length = int(self.headers.get("Content-Length", 0))
+        self._body_read = True
+        return self.rfile.read(content_length) if content_length else b""
+
+    def _read_json(self):
+        # Returns None when the body isn't a JSON object
+        try:
+            data = orjson.loads(self._read_body())
+        except orjson.JSONDecodeError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _send_response(self, status, data=None, extra_headers=""):
+        # orjson returns bytes directly, so there is no separate encode step
+        if data is None:
+            payload = b""
+        else:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if self._pretty else None)
+        self._send_payload(status, payload, extra_headers)
+
+    @classmethod
+    def _cache_transaction(cls, transaction):
+        # callers hold _lock, so a write can't slip in between dumps and store
+        payload = orjson.dumps(transaction)
+        cls._json_by_id[transaction["id"]] = payload
+        return payload
+
+    def _send_transaction(self, status, transaction, payload):
+        if self._pretty:
+            self._send_response(status, transaction)
+        else:
+            self._send_payload(status, payload)
+
+    def _send_error(self, status, message):
+        self._send_payload(status, _ERROR_BLOBS[message][self._pretty])
+
+    def _send_payload(self, status, payload, extra_headers=""):
+        # a request body we never read would be parsed as the next request
+        if not self._body_read and self.headers.get("Content-Length", "0") != "0":
+            self.close_connection = True
+            extra_headers += "Connection: close\r\n"
+
+        # status line, headers and (small) body go out in a single write
+        self.log_request(status)
+        head = (
+            f"{self.protocol_version} {status} {self.responses[status][0]}\r\n"
+            f"Server: {self.version_string()}\r\n"
+            f"Date: {self.date_time_string()}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"{extra_headers}\r\n"
+        )
+        if len(payload) > _COALESCE_LIMIT:
+            self.wfile.write(head.encode("latin-1"))
+            self.wfile.write(payload)
+        else:
+            self.wfile.write(head.encode("latin-1") + payload)
         
     def _unauthorized(self):
-        self.send_response(401)
-        self.send_header("WWW-Authenticate",'Basic realm="Secure Area"')
-        self.end_headers()
+        self._send_payload(401, b"", 'WWW-Authenticate: Basic realm="Secure Area"\r\n')
 
     def _check_auth(self):
         if not is_authenticated(self.headers):
@@ -28,85 +120,194 @@ class TransactionHandler(BaseHTTPRequestHandler):
             return False
         return True
     
+    def _match_path(self):
+        # Returns "" for /transactions and the raw ID for /transactions/<id>;
+        # sends a 404 and returns None for anything else
+        path, _, query = self.path.partition("?")
+        if query:
+            self._params = parse_qs(query)
+            # responses are compact unless the client asks for ?pretty=1
+            self._pretty = self._params.get("pretty") == ["1"]
+
+        if path == _COLLECTION_PATH:
+            return ""
+        if path.startswith(_ITEM_PREFIX):
+            raw_id = path[len(_ITEM_PREFIX):]
+            if raw_id and "/" not in raw_id:
+                return raw_id
+
+        self._send_error(404, "Endpoint not found")
+        return None
+
+    def _parse_id(self, raw_id):
+        try:
+            return int(raw_id)
+        except ValueError:
+            self._send_error(400, "Invalid ID")
+            return None
+
+    def _parse_limit(self):
+        # Returns the ?limit=N of a list request (None if absent), or sends
+        # a 400 and returns False
+        if "limit" not in self._params:
+            return None
+        try:
+            limit = int(self._params["limit"][-1])
+        except ValueError:
+            limit = -1
+        if limit < 0:
+            self._send_error(400, "Invalid limit")
+            return False
+        return limit
+
+    def _match_id(self):
+        raw_id = self._match_path()
+        if raw_id is None:
+            return None
+        if not raw_id:
+            self._send_error(404, "Endpoint not found")
+            return None
+        return self._parse_id(raw_id)
+
     def do_GET(self):
         if not self._check_auth():
             return
         
-        if self.path == "/transactions":
-            self._send_response(200, transactions)
-        elif self.path.startswith("/transactions/"):
-            try:
-                transaction_ID = int(self.path.split("/")[-1])
-                transaction = next(
-                    (t for t in transactions if t["id"] == transaction_ID),
-                    None
-                )
-
-                if transaction:
-                    self._send_response(200, transaction)
-                else: 
-                    self._send_response(404, {"error": "Transaction not found"})
-            except ValueError:
-                self._send_response(400, {"error" : "Invalid ID"})
+        raw_id = self._match_path()
+        if raw_id is None:
+            return
+
+        if not raw_id:
+            limit = self._parse_limit()
+            if limit is False:
+                return
+
+            # the full count goes in a header, so a client can ask for
+            # ?limit=0 or ?limit=1 instead of downloading every transaction
+            count_header = f"X-Total-Count: {storage.get_count()}\r\n"
+            if self._pretty:
+                self._send_response(200, storage.get_all(limit), count_header)
+                return
+
+            if limit is not None:
+                with _lock:
+                    json_by_id = TransactionHandler._json_by_id
+                    payload = b"[" + b",".join(
+                        json_by_id.get(t["id"]) or TransactionHandler._cache_transaction(t)
+                        for t in storage.get_all(limit)
+                    ) + b"]"
+                self._send_payload(200, payload, count_header)
+                return
+
+            payload = TransactionHandler._all_cache
+            if payload is None:
+                with _lock:
+                    if TransactionHandler._all_cache is None:
+                        # stitch the list together from the per-transaction bodies,
+                        # so only transactions that changed get serialized again
+                        json_by_id = TransactionHandler._json_by_id
+                        TransactionHandler._all_cache = b"[" + b",".join(
+                            json_by_id.get(t["id"]) or TransactionHandler._cache_transaction(t)
+                            for t in storage.get_all()
+                        ) + b"]"
+                    payload = TransactionHandler._all_cache
+            self._send_payload(200, payload, count_header)
+            return
+
+        transaction_ID = self._parse_id(raw_id)
+        if transaction_ID is None:
+            return
+
+        if self._pretty:
+            transaction = storage.get_by_id(transaction_ID)
+            if transaction is not None:
+                self._send_response(200, transaction)
+            else:
+                self._send_error(404, "Transaction not found")
+            return
+
+        payload = TransactionHandler._json_by_id.get(transaction_ID)
+        if payload is None:
+            with _lock:
+                transaction = storage.get_by_id(transaction_ID)
+                if transaction is not None:
+                    payload = TransactionHandler._cache_transaction(transaction)
+
+        if payload is not None:
+            self._send_payload(200, payload)
+        else:
+            self._send_error(404, "Transaction not found")
     
     def do_POST(self):
         if not self._check_auth():
             return
         
-        if self.path == "/transactions":
-            content_length = int(self.headers["Content-Length"])
-            body = self.rfile.read(content_length)
-            try:
-               new_transaction = json.loads(body.decode("utf-8"))
-            except json.JSONDecodeError:
-                self._send_response (400, {"error":"Invalid JSON"})
-                return
+        raw_id = self._match_path()
+        if raw_id is None:
+            return
+        if raw_id:
+            self._send_error(404, "Endpoint not found")
+            return
+
+        new_transaction = self._read_json()
+        if new_transaction is None:
+            self._send_error(400, "Invalid JSON")
+            return
 
-            new_transaction["id"] = max([t["id"] for t in transactions], default=0) + 1
-            transactions.append(new_transaction)
-            
-            self._send_response(201, new_transaction)
+        # the server always picks the ID
+        new_transaction["id"] = None
+        cls = TransactionHandler
+        with _lock:
+            storage.add(new_transaction)
+            payload = cls._cache_transaction(new_transaction)
+            cls._all_cache = None
+        
+        self._send_transaction(201, new_transaction, payload)
 
     def do_PUT(self):
         if not self._check_auth():
             return
         
-        if self.path.startswith("/transactions/"):
-            transaction_ID = int(self.path.split("/")[-1])
-            content_length = int(self.headers["Content-Length"])
-            body = self.rfile.read(content_length)
-            updated_data = json.loads(body)
-
-            try:
-                updated_data = json.loads(body.decode())
-            except json.JSONDecodeError:
-                self._send_response(400, {"error":"Invalid JSON"})
-                return
+        transaction_ID = self._match_id()
+        if transaction_ID is None:
+            return
+
+        updated_data = self._read_json()
+        if updated_data is None:
+            self._send_error(400, "Invalid JSON")
+            return
 
-            for transaction in transactions:
-                if transaction["id"] == transaction_ID:
-                    transaction.update(updated_data)
-                    self._send_response(200, transaction)
-                    return
-            
-            self._send_response(404, {"error": "Transaction not found"})
+        with _lock:
+            updated = storage.update(transaction_ID, updated_data)
+            if updated is not None:
+                payload = TransactionHandler._cache_transaction(updated)
+                TransactionHandler._all_cache = None
+
+        if updated is not None:
+            self._send_transaction(200, updated, payload)
+        else:
+            self._send_error(404, "Transaction not found")
     
     def do_DELETE(self):
         if not self._check_auth():
             return
         
-        if self.path.startswith("/transactions/"):
-            transaction_ID = int(self.path.split("/")[-1])
+        transaction_ID = self._match_id()
+        if transaction_ID is None:
+            return
+
+        with _lock:
+            deleted = storage.delete(transaction_ID)
+            if deleted is not None:
+                TransactionHandler._json_by_id.pop(transaction_ID, None)
+                TransactionHandler._all_cache = None
 
-            for transaction in transactions:
-                if transaction["id"] == transaction_ID:
-                    transactions.remove(transaction)
-                    self._send_response(200, {"message": "Transaction deleted"})
-                    return
-            
-            self._send_response(404, {"error": "Transaction not found"})
+        if deleted is not None:
+            self._send_payload(200, _DELETED_BLOBS[self._pretty])
+        else:
+            self._send_error(404, "Transaction not found")
 
 if __name__ == "__main__":
-    server = HTTPServer((HOST, PORT), TransactionHandler)
+    server = ThreadingHTTPServer((HOST, PORT), TransactionHandler)
     print(f"Server running at http://{HOST}:{PORT}")
     server.serve_forever()
\ No newline at end of file
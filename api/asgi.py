@@ -0,0 +1,166 @@
+import orjson
+from starlette.applications import Starlette
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.routing import Route
+
+from api.auth import is_authenticated
+from api.storage import storage
+
+HOST = "localhost"
+PORT = 8000
+
+
+def _json_response(request, status, data):
+    # Compact unless the client asks for ?pretty=1, like api/app.py
+    option = orjson.OPT_INDENT_2 if request.query_params.get("pretty") == "1" else None
+    return Response(orjson.dumps(data, option=option), status_code=status, media_type="application/json")
+
+
+def _parse_id(raw_id):
+    # Same rule as api/app.py: anything int() accepts is an ID (0 and
+    # negatives just aren't found), anything else is a 400
+    try:
+        return int(raw_id)
+    except ValueError:
+        return None
+
+
+# api/app.py answers any other method (HEAD and PATCH included) with a 501
+_SUPPORTED_METHODS = frozenset(("GET", "POST", "PUT", "DELETE"))
+
+
+class SupportedMethodsMiddleware:
+    """Send 501 for methods the API doesn't implement, before auth, like api/app.py"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] not in _SUPPORTED_METHODS:
+            response = Response(
+                orjson.dumps({"error": "Unsupported method"}),
+                status_code=501,
+                media_type="application/json"
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+class BasicAuthMiddleware:
+    """Reject any request without valid Basic Auth before it reaches a route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not is_authenticated(Headers(scope=scope)):
+            response = Response(
+                status_code=401,
+                headers={"WWW-Authenticate": 'Basic realm="Secure Area"'}
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+async def _read_json(request):
+    # Returns None when the body isn't a JSON object
+    try:
+        data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+async def list_transactions(request):
+    limit = None
+    if "limit" in request.query_params:
+        try:
+            limit = int(request.query_params["limit"])
+        except ValueError:
+            limit = -1
+        if limit < 0:
+            return _json_response(request, 400, {"error": "Invalid limit"})
+
+    # The full count goes in a header, so ?limit=1 still tells the client
+    # how many transactions there are
+    response = _json_response(request, 200, storage.get_all(limit))
+    response.headers["X-Total-Count"] = str(storage.get_count())
+    return response
+
+
+async def get_transaction(request):
+    transaction_ID = _parse_id(request.path_params["transaction_id"])
+    if transaction_ID is None:
+        return _json_response(request, 400, {"error": "Invalid ID"})
+
+    transaction = storage.get_by_id(transaction_ID)
+    if transaction is None:
+        return _json_response(request, 404, {"error": "Transaction not found"})
+    return _json_response(request, 200, transaction)
+
+
+async def create_transaction(request):
+    new_transaction = await _read_json(request)
+    if new_transaction is None:
+        return _json_response(request, 400, {"error": "Invalid JSON"})
+
+    # The server always assigns the ID
+    new_transaction["id"] = None
+    return _json_response(request, 201, storage.add(new_transaction))
+
+
+async def update_transaction(request):
+    transaction_ID = _parse_id(request.path_params["transaction_id"])
+    if transaction_ID is None:
+        return _json_response(request, 400, {"error": "Invalid ID"})
+
+    updated_data = await _read_json(request)
+    if updated_data is None:
+        return _json_response(request, 400, {"error": "Invalid JSON"})
+
+    transaction = storage.update(transaction_ID, updated_data)
+    if transaction is None:
+        return _json_response(request, 404, {"error": "Transaction not found"})
+    return _json_response(request, 200, transaction)
+
+
+async def delete_transaction(request):
+    transaction_ID = _parse_id(request.path_params["transaction_id"])
+    if transaction_ID is None:
+        return _json_response(request, 400, {"error": "Invalid ID"})
+
+    if storage.delete(transaction_ID) is None:
+        return _json_response(request, 404, {"error": "Transaction not found"})
+    return _json_response(request, 200, {"message": "Transaction deleted"})
+
+
+async def not_found(request, exc):
+    # Unknown paths, and methods a path doesn't take (POST /transactions/1),
+    # get the same JSON 404 api/app.py sends instead of Starlette's plain-text
+    # 404/405
+    return _json_response(request, 404, {"error": "Endpoint not found"})
+
+
+app = Starlette(exception_handlers={404: not_found, 405: not_found}, routes=[
+    Route("/transactions", list_transactions, methods=["GET"]),
+    Route("/transactions", create_transaction, methods=["POST"]),
+    Route("/transactions/{transaction_id}", get_transaction, methods=["GET"]),
+    Route("/transactions/{transaction_id}", update_transaction, methods=["PUT"]),
+    Route("/transactions/{transaction_id}", delete_transaction, methods=["DELETE"]),
+])
+# No slash redirects: /transactions/ and /transactions/1/ are 404s in api/app.py
+app.router.redirect_slashes = False
+app.add_middleware(BasicAuthMiddleware)
+# Added last, so it runs first
+app.add_middleware(SupportedMethodsMiddleware)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvicorn picks uvloop + httptools automatically when they're installed.
+    # A single worker keeps the in-memory storage consistent across requests.
+    uvicorn.run("api.asgi:app", host=HOST, port=PORT)
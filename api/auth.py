@@ -3,14 +3,19 @@ import base64
 USERNAME = "admin"
 PASSWORD = "momosmsanalysis"
 
+VALID_CREDENTIALS = {USERNAME: PASSWORD}
+
+# base64 of each valid "user:password" pair, so a request header can be
+# checked with one set lookup instead of being decoded and split
+VALID_TOKENS = frozenset(
+    base64.b64encode(f"{user}:{password}".encode("utf-8")).decode("ascii")
+    for user, password in VALID_CREDENTIALS.items()
+)
+
 def is_authenticated(headers):
     auth_header = headers.get("Authorization")
 
     if not auth_header or not auth_header.startswith("Basic "):
         return False
-    
-    encoded_credentials = auth_header.split(" ")[1]
-    decoded = base64.b64decode(encoded_credentials).decode("utf-8")
-    username, password = decoded.split(":")
 
-    return username == USERNAME and password == PASSWORD
\ No newline at end of file
+    return auth_header[len("Basic "):] in VALID_TOKENS
@@ -1,3 +1,25 @@
+import sys
+from itertools import islice
+from operator import itemgetter
+
+# Fields that repeat the same few strings across many transactions ("SENT",
+# "You", the same merchants...). Interning them makes every transaction
+# share one copy of each string instead of holding its own.
+_INTERNED_FIELDS = ('type', 'sender', 'receiver')
+
+
+def _intern_fields(transaction):
+    for field in _INTERNED_FIELDS:
+        value = transaction.get(field)
+        if type(value) is str:
+            transaction[field] = sys.intern(value)
+
+
+def _as_id(transaction_id):
+    """IDs are stored as ints; convert the string form"""
+    return int(transaction_id) if type(transaction_id) is str else transaction_id
+
+
 class TransactionStorage:
     """
     Stores all our transactions in a dictionary so we can find them instantly.
@@ -8,44 +30,76 @@ class TransactionStorage:
         # Main storage - using a dict because it's O(1) for lookups
         self.transactions = {}
         self.next_id = 1  # Keep track of next available ID
+        # Indexes for search_by_field: field -> {value: {id: None}}
+        # Each one gets built the first time someone searches that field
+        self._field_indexes = {}
+        # (field, value) buckets that an existing transaction re-joined at the
+        # end; search_by_field puts them back in storage order before use
+        self._unordered = set()
     
     def load_transactions(self, transaction_list):
         """
         Takes a list of transactions and loads them into our dictionary.
         This is where we convert from slow list to fast dict!
         """
+        # Fields that were searched before get their indexes rebuilt after loading
+        indexed_fields = list(self._field_indexes)
+        self._field_indexes.clear()
+        self._unordered.clear()
+        
+        # Track the highest ID while we build the dict so we don't need a second pass
+        max_id = self.next_id - 1
+        without_id = []
+        # Bound once here since this loop runs for every transaction
+        transactions = self.transactions
+        
         for transaction in transaction_list:
-            # Make sure every transaction has an ID
-            if 'id' not in transaction:
-                transaction['id'] = self.next_id
-                self.next_id += 1
+            trans_id = transaction.get('id')
+            # Transactions without an ID get one once we know the highest existing ID
+            if trans_id is None:
+                without_id.append(transaction)
+                continue
             
-            # Convert string IDs to integers for consistency
-            trans_id = int(transaction['id']) if isinstance(transaction['id'], str) else transaction['id']
-            transaction['id'] = trans_id
+            # Convert string IDs to integers for consistency - every ID
+            # is an int from here on, so lookups never hash a string
+            if type(trans_id) is not int:
+                trans_id = transaction['id'] = _as_id(trans_id)
             
             # Store it in our dictionary - this is the magic part!
-            self.transactions[trans_id] = transaction
+            _intern_fields(transaction)
+            transactions[trans_id] = transaction
             
-            # Update next_id to avoid conflicts
-            if trans_id >= self.next_id:
-                self.next_id = trans_id + 1
+            if trans_id > max_id:
+                max_id = trans_id
+        
+        # Update next_id once, after the loop, to avoid conflicts
+        self.next_id = max_id + 1
+        
+        for transaction in without_id:
+            self.add(transaction)
+        
+        if indexed_fields:
+            self._build_indexes(indexed_fields)
         
         return len(self.transactions)
     
-    def get_all(self):
-        """Get all transactions as a list"""
-        return list(self.transactions.values())
+    def get_all(self, limit=None):
+        """Get all transactions as a list, or just the first `limit` of them"""
+        # A limit past the end (even one too big for islice) means everything
+        if limit is None or limit >= len(self.transactions):
+            return list(self.transactions.values())
+        return list(islice(self.transactions.values(), limit))
     
     def get_by_id(self, transaction_id):
         """
         This is the star of the show - O(1) lookup!
         Just give me an ID and I'll find it instantly
         """
-        # Convert to int if needed
-        if isinstance(transaction_id, str):
-            transaction_id = int(transaction_id)
-        return self.transactions.get(transaction_id)
+        transaction = self.transactions.get(transaction_id)
+        if transaction is None and type(transaction_id) is str:
+            # Keys are ints, so only string IDs pay for the conversion
+            transaction = self.transactions.get(int(transaction_id))
+        return transaction
     
     def add(self, transaction):
         """Add a new transaction to storage"""
@@ -55,53 +109,166 @@ class TransactionStorage:
             self.next_id += 1
         
         # Convert ID to int
-        trans_id = int(transaction['id']) if isinstance(transaction['id'], str) else transaction['id']
-        transaction['id'] = trans_id
+        trans_id = transaction['id'] = _as_id(transaction['id'])
+        
+        # Replacing an existing transaction keeps its place in storage,
+        # so it has to keep its place in the indexes too
+        old = self.transactions.get(trans_id)
         
         # Save it
+        _intern_fields(transaction)
         self.transactions[trans_id] = transaction
+        if old is None:
+            self._index(transaction)
+        else:
+            self._reindex(transaction, self._indexed_values(old))
         return transaction
     
     def update(self, transaction_id, updated_data):
         """Update an existing transaction with new data"""
-        # Convert ID to int
-        if isinstance(transaction_id, str):
+        transaction = self.transactions.get(transaction_id)
+        if transaction is None:
+            if type(transaction_id) is not str:
+                return None
             transaction_id = int(transaction_id)
-            
-        if transaction_id not in self.transactions:
-            return None
+            transaction = self.transactions.get(transaction_id)
+            if transaction is None:
+                return None
         
-        # Update the fields
-        transaction = self.transactions[transaction_id]
-        transaction.update(updated_data)
-        # Make sure the ID stays the same
-        transaction['id'] = transaction_id
+        # Update the fields in place
+        old_values = self._indexed_values(transaction)
+        try:
+            transaction.update(updated_data)
+            # Make sure the ID stays the same
+            transaction['id'] = transaction_id
+            _intern_fields(transaction)
+        finally:
+            # Re-index even if the update failed, so the indexes always
+            # match what's actually in storage
+            self._reindex(transaction, old_values)
         
         return transaction
     
     def delete(self, transaction_id):
         """Remove a transaction from storage"""
-        # Convert ID to int
-        if isinstance(transaction_id, str):
+        transaction = self.transactions.pop(transaction_id, None)
+        if transaction is None and type(transaction_id) is str:
             transaction_id = int(transaction_id)
-        return self.transactions.pop(transaction_id, None)
+            transaction = self.transactions.pop(transaction_id, None)
+        if transaction is not None:
+            self._unindex(transaction)
+        return transaction
     
     def exists(self, transaction_id):
         """Check if a transaction exists"""
-        if isinstance(transaction_id, str):
-            transaction_id = int(transaction_id)
-        return transaction_id in self.transactions
+        if transaction_id in self.transactions:
+            return True
+        return type(transaction_id) is str and int(transaction_id) in self.transactions
     
     def search_by_field(self, field, value):
         """
         Find all transactions that match a certain field value.
         Like finding all "SENT" transactions or all from a specific sender.
+        The first search on a field builds an index for it, so every search
+        after that is a dictionary lookup instead of a full scan.
         """
-        results = []
-        for transaction in self.transactions.values():
-            if transaction.get(field) == value:
-                results.append(transaction)
-        return results
+        index = self._field_indexes.get(field)
+        if index is None:
+            index = self._build_index(field)
+        
+        if index is None:
+            # Field has unhashable values (lists, dicts...) so just scan
+            return [t for t in self.transactions.values() if t.get(field) == value]
+        
+        try:
+            matching_ids = index.get(value, ())
+            if matching_ids and (field, value) in self._unordered:
+                matching_ids = self._reorder(field, value)
+        except TypeError:
+            # Unhashable search value - nothing in an indexed field can equal it
+            return []
+        return [self.transactions[trans_id] for trans_id in matching_ids]
+    
+    def _build_index(self, field):
+        """Group transaction IDs by their value for one field"""
+        self._build_indexes((field,))
+        return self._field_indexes.get(field)
+    
+    def _build_indexes(self, fields):
+        """Build the indexes for several fields in a single pass over storage"""
+        indexes = {field: {} for field in fields}
+        for trans_id, transaction in self.transactions.items():
+            for field, index in list(indexes.items()):
+                try:
+                    index.setdefault(transaction.get(field), {})[trans_id] = None
+                except TypeError:
+                    # Unhashable value - this field gets scanned instead
+                    del indexes[field]
+            if not indexes:
+                break
+        
+        self._field_indexes.update(indexes)
+    
+    def _index(self, transaction):
+        """Add a transaction to every index built so far"""
+        for field, index in list(self._field_indexes.items()):
+            try:
+                index.setdefault(transaction.get(field), {})[transaction['id']] = None
+            except TypeError:
+                # Can't index this value - drop the index, the next search falls back to a scan
+                del self._field_indexes[field]
+    
+    def _indexed_values(self, transaction):
+        """The transaction's current value for every indexed field"""
+        return {field: transaction.get(field) for field in self._field_indexes}
+    
+    def _reindex(self, transaction, old_values):
+        """
+        Move an existing transaction between buckets after its fields changed.
+        Fields whose value didn't change are left alone, so the transaction
+        keeps its position there.
+        """
+        trans_id = transaction['id']
+        for field, old_value in old_values.items():
+            index = self._field_indexes.get(field)
+            if index is None:
+                continue
+            value = transaction.get(field)
+            if value == old_value:
+                continue
+            
+            bucket = index.get(old_value)
+            if bucket is not None:
+                bucket.pop(trans_id, None)
+                if not bucket:
+                    del index[old_value]
+            try:
+                bucket = index.setdefault(value, {})
+            except TypeError:
+                # Can't index this value - drop the index, the next search falls back to a scan
+                del self._field_indexes[field]
+                continue
+            bucket[trans_id] = None
+            if len(bucket) > 1:
+                self._unordered.add((field, value))
+    
+    def _reorder(self, field, value):
+        """Put one bucket back in storage order"""
+        bucket = self._field_indexes[field][value]
+        ordered = {trans_id: None for trans_id in self.transactions if trans_id in bucket}
+        self._field_indexes[field][value] = ordered
+        self._unordered.discard((field, value))
+        return ordered
+    
+    def _unindex(self, transaction):
+        """Remove a transaction from every index built so far"""
+        for field, index in self._field_indexes.items():
+            value = transaction.get(field)
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.pop(transaction['id'], None)
+                if not bucket:
+                    del index[value]
     
     def get_count(self):
         """How many transactions do we have?"""
@@ -110,6 +277,8 @@ class TransactionStorage:
     def clear(self):
         """Clear everything - start fresh"""
         self.transactions.clear()
+        self._field_indexes.clear()
+        self._unordered.clear()
         self.next_id = 1
 
 
@@ -119,13 +288,12 @@ def linear_search(transaction_list, transaction_id):
     This is slow but simple. O(n) means it takes longer as the list grows.
     """
     # Convert ID to int if it's a string
-    if isinstance(transaction_id, str):
-        transaction_id = int(transaction_id)
+    transaction_id = _as_id(transaction_id)
     
     for transaction in transaction_list:
         trans_id = transaction.get('id')
         # Handle both string and int IDs
-        if isinstance(trans_id, str):
+        if type(trans_id) is str:
             trans_id = int(trans_id)
         if trans_id == transaction_id:
             return transaction
@@ -137,9 +305,8 @@ def dictionary_lookup(transaction_dict, transaction_id):
     The fast way - go straight to the transaction using the ID as a key.
     O(1) means it's always instant, no matter how many transactions we have!
     """
-    # Convert ID to int if needed
-    if isinstance(transaction_id, str):
-        transaction_id = int(transaction_id)
+    # Convert ID to int if it's a string
+    transaction_id = _as_id(transaction_id)
     return transaction_dict.get(transaction_id)
 
 
@@ -148,32 +315,33 @@ def compare_search_methods(transactions, search_id):
     Let's race! Linear search vs dictionary lookup.
     Spoiler: dictionary wins every time, especially with lots of data.
     """
-    import time
+    import timeit
     
     # Convert ID to int for fair comparison
-    if isinstance(search_id, str):
-        search_id = int(search_id)
+    search_id = _as_id(search_id)
     
     # Build a dictionary from the list for comparison
-    trans_dict = {}
-    for t in transactions:
-        trans_id = int(t['id']) if isinstance(t['id'], str) else t['id']
-        trans_dict[trans_id] = t
+    trans_dict = dict(zip(map(_as_id, map(itemgetter('id'), transactions)), transactions))
     
-    # Test linear search - checking each one
-    start = time.perf_counter()
     result_linear = linear_search(transactions, search_id)
-    time_linear = time.perf_counter() - start
+    result_dict = dictionary_lookup(trans_dict, search_id)
     
+    # A single search is too quick to time on its own - the clock's jitter
+    # would swamp it - so time batches of calls and keep the fastest batch
+    number = 100
+    # Test linear search - checking each one
+    time_linear = min(timeit.repeat(
+        lambda: linear_search(transactions, search_id), number=number, repeat=5
+    )) / number
     # Test dictionary lookup - direct access
-    start = time.perf_counter()
-    result_dict = dictionary_lookup(trans_dict, search_id)
-    time_dict = time.perf_counter() - start
+    time_dict = min(timeit.repeat(
+        lambda: dictionary_lookup(trans_dict, search_id), number=number, repeat=5
+    )) / number
     
     return {
         'linear_search_time': time_linear,
         'dictionary_lookup_time': time_dict,
-        'speedup': time_linear / time_dict if time_dict > 0 else float('inf'),
+        'speedup': time_linear / max(time_dict, 1e-9),
         'found_linear': result_linear is not None,
         'found_dict': result_dict is not None
     }
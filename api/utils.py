@@ -1,5 +1,30 @@
 import re
 from datetime import datetime
+from functools import lru_cache
+from operator import methodcaller
+
+_get_amount = methodcaller('get', 'amount', 0)
+
+# Response shapes copied by create_error_response / create_success_response;
+# copying a finished dict is cheaper than building a new one from scratch
+_ERROR_TEMPLATE = {'error': True, 'message': '', 'status_code': 400}
+_SUCCESS_TEMPLATE = {'error': False, 'data': None}
+
+# Compiled once here instead of on every call
+_PATH_ID_RE = re.compile(r'/transactions/(\d+)')
+# Formatting characters stripped from phone numbers before checking them
+_PHONE_STRIP = str.maketrans('', '', ' -+')
+
+# Transaction types validate_transaction_data accepts
+_TYPE_NAMES = ('send', 'receive', 'deposit', 'withdraw', 'payment', 'transfer')
+_VALID_TYPES = frozenset(_TYPE_NAMES)
+_VALID_TYPES_MSG = "Type must be one of: " + ", ".join(_TYPE_NAMES)
+
+# The usual shapes of the timestamps we accept, checked by validate_timestamp
+# before it falls back to strptime: YYYY-MM-DD[( |T)HH:MM:SS] and
+# DD/MM/YYYY HH:MM:SS (or MM/DD/YYYY HH:MM:SS)
+_ISO_TIMESTAMP_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})(?:[ T](\d{2}):(\d{2}):(\d{2}))?', re.ASCII)
+_SLASH_TIMESTAMP_RE = re.compile(r'(\d{2})/(\d{2})/(\d{4}) (\d{2}):(\d{2}):(\d{2})', re.ASCII)
 
 
 def generate_transaction_id(existing_ids=None):
@@ -40,10 +65,9 @@ def validate_transaction_data(transaction_data, required_fields=None, is_update=
     
     # Validate transaction type
     if 'type' in transaction_data:
-        valid_types = ['send', 'receive', 'deposit', 'withdraw', 'payment', 'transfer']
         trans_type = str(transaction_data['type']).lower()
-        if trans_type not in valid_types:
-            errors.append(f"Type must be one of: {', '.join(valid_types)}")
+        if trans_type not in _VALID_TYPES:
+            errors.append(_VALID_TYPES_MSG)
     
     # Sender can't be empty
     if 'sender' in transaction_data:
@@ -81,7 +105,28 @@ def validate_timestamp(timestamp):
     if not timestamp:
         return False
     
-    # Try different date formats that we might receive
+    timestamp = str(timestamp)
+    
+    # Fast path: build the datetime straight from the regex groups
+    try:
+        match = _ISO_TIMESTAMP_RE.fullmatch(timestamp)
+        if match:
+            datetime(*map(int, match.groups(0)))
+            return True
+        
+        match = _SLASH_TIMESTAMP_RE.fullmatch(timestamp)
+        if match:
+            day_or_month, month_or_day, year, hour, minute, second = map(int, match.groups())
+            try:
+                datetime(year, month_or_day, day_or_month, hour, minute, second)  # day/month
+            except ValueError:
+                datetime(year, day_or_month, month_or_day, hour, minute, second)  # month/day
+            return True
+    except ValueError:
+        pass
+    
+    # Anything else (or an out-of-range value the regex let through) gets
+    # the full strptime check, so the accepted formats are exactly as before
     date_formats = [
         '%Y-%m-%d %H:%M:%S',
         '%Y-%m-%dT%H:%M:%S',
@@ -92,7 +137,7 @@ def validate_timestamp(timestamp):
     
     for fmt in date_formats:
         try:
-            datetime.strptime(str(timestamp), fmt)
+            datetime.strptime(timestamp, fmt)
             return True
         except ValueError:
             continue
@@ -106,7 +151,7 @@ def validate_phone_number(phone):
         return False
     
     # Strip out common formatting characters
-    phone_clean = str(phone).replace(' ', '').replace('-', '').replace('+', '')
+    phone_clean = str(phone).translate(_PHONE_STRIP)
     
     # Should be all digits and between 7-15 characters
     if phone_clean.isdigit() and 7 <= len(phone_clean) <= 15:
@@ -117,18 +162,11 @@ def validate_phone_number(phone):
 
 def sanitize_transaction_data(transaction_data):
     """Clean up transaction data by removing None values and trimming strings"""
-    cleaned = {}
-    
-    for key, value in transaction_data.items():
-        if value is None:
-            continue
-        
-        if isinstance(value, str):
-            cleaned[key] = value.strip()
-        else:
-            cleaned[key] = value
-    
-    return cleaned
+    return {
+        key: value.strip() if isinstance(value, str) else value
+        for key, value in transaction_data.items()
+        if value is not None
+    }
 
 
 def format_transaction_response(transaction):
@@ -138,12 +176,12 @@ def format_transaction_response(transaction):
     # Format amount to 2 decimal places
     if 'amount' in result:
         try:
-            result['amount'] = f"{float(result['amount']):.2f}"
+            result['amount'] = _format_amount(result['amount'])
         except (ValueError, TypeError):
             pass  # just leave it as-is if we can't convert
     
-    # Make sure ID is integer
-    if 'id' in result:
+    # Make sure ID is integer (storage already keeps them as ints)
+    if 'id' in result and type(result['id']) is not int:
         try:
             result['id'] = int(result['id'])
         except (ValueError, TypeError):
@@ -152,6 +190,13 @@ def format_transaction_response(transaction):
     return result
 
 
+@lru_cache(maxsize=4096)
+def _format_amount(amount):
+    # The same amounts (1000, 5000...) come up over and over, so each one
+    # is only converted and formatted the first time it's seen
+    return f"{float(amount):.2f}"
+
+
 def parse_transaction_id(id_string):
     """Parse transaction ID from string, returns None if invalid"""
     try:
@@ -166,19 +211,16 @@ def parse_transaction_id(id_string):
 
 def create_error_response(message, status_code=400):
     """Helper to create standard error response"""
-    return {
-        'error': True,
-        'message': message,
-        'status_code': status_code
-    }
+    response = _ERROR_TEMPLATE.copy()
+    response['message'] = message
+    response['status_code'] = status_code
+    return response
 
 
 def create_success_response(data, message=None):
     """Helper to create standard success response"""
-    response = {
-        'error': False,
-        'data': data
-    }
+    response = _SUCCESS_TEMPLATE.copy()
+    response['data'] = data
     
     if message:
         response['message'] = message
@@ -190,8 +232,7 @@ def extract_id_from_path(path):
     """
     Extract transaction ID from URL path like /transactions/123
     """
-    pattern = r'/transactions/(\d+)'
-    match = re.search(pattern, path)
+    match = _PATH_ID_RE.search(path)
     
     if match:
         return int(match.group(1))
@@ -201,11 +242,23 @@ def extract_id_from_path(path):
 
 def filter_transactions(transactions, filters):
     """Filter list of transactions by given criteria"""
-    result = transactions
-    
-    for key, value in filters.items():
-        if value is not None:
-            result = [t for t in result if t.get(key) == value]
+    active = [(key, value) for key, value in filters.items() if value is not None]
+    
+    if not active:
+        return transactions
+    if len(active) == 1:
+        key, value = active[0]
+        return [t for t in transactions if t.get(key) == value]
+    
+    # Check every filter on each transaction in one pass, stopping at the
+    # first mismatch, instead of building a new list per filter
+    result = []
+    for t in transactions:
+        for key, value in active:
+            if t.get(key) != value:
+                break
+        else:
+            result.append(t)
     
     return result
 
@@ -219,16 +272,20 @@ def get_transaction_summary(transactions):
             'average_amount': 0
         }
     
-    total = 0
     count = len(transactions)
     
-    for trans in transactions:
-        try:
-            amount = float(trans.get('amount', 0))
-            total += amount
-        except (ValueError, TypeError):
-            # skip invalid amounts
-            pass
+    try:
+        # Common case: every amount converts, so the whole sum runs in C
+        total = sum(map(float, map(_get_amount, transactions)), 0.0)
+    except (ValueError, TypeError):
+        total = 0
+        for trans in transactions:
+            try:
+                amount = float(trans.get('amount', 0))
+                total += amount
+            except (ValueError, TypeError):
+                # skip invalid amounts
+                pass
     
     avg = round(total / count, 2) if count > 0 else 0
     
@@ -18,8 +18,11 @@ Why Dictionary Lookup is Faster:
 - For 1,691 transactions: ~155x faster in benchmarks
 """
 
+from operator import itemgetter
 from typing import List, Dict, Any, Optional
 
+_get_id = itemgetter('id')
+
 
 def create_transaction_dict(transactions: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
     """
@@ -42,7 +45,8 @@ def create_transaction_dict(transactions: List[Dict[str, Any]]) -> Dict[str, Dic
         >>> print(trans_dict)
         {"1": {"id": "1", "amount": 100}, "2": {"id": "2", "amount": 200}}
     """
-    return {transaction['id']: transaction for transaction in transactions}
+    # map/zip/dict all run in C, so there is no per-row bytecode
+    return dict(zip(map(_get_id, transactions), transactions))
 
 
 def dict_lookup(transaction_dict: Dict[str, Dict[str, Any]], transaction_id: str) -> Optional[Dict[str, Any]]:
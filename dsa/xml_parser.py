@@ -5,48 +5,211 @@ Converts XML data to JSON format
 Author: Role A - Data Parsing & DSA Lead
 """
 
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
 from pathlib import Path
-from typing import List, Dict, Any
-import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 import re
 
+import orjson
 
-def parse_xml_file(xml_path: Path) -> List[Dict[str, Any]]:
+# SMS per task when parse_xml_file fans out to worker processes
+PARALLEL_BATCH_SIZE = 256
+
+# Transaction patterns, compiled once when the module loads. Group names carry
+# a per-pattern prefix so they stay unique inside BODY_RE below.
+# The messages are ASCII, so re.ASCII keeps \d and \s to their ASCII sets
+# rather than checking each character against the Unicode tables.
+RECEIVED_RE = re.compile(r"You have received (?P<recv_amount>\d+(?:,\d+)*) RWF from (?P<recv_sender>[^(]+)\s*\([^)]+\).*Your new balance:(?P<recv_balance>\d+(?:,\d+)*) RWF.*Transaction Id: (?P<recv_txid>\d+)", re.ASCII)
+TRANSFER_RE = re.compile(r"(?P<xfer_amount>\d+(?:,\d+)*) RWF transferred to (?P<xfer_receiver>[^(]+)\s*\((?P<xfer_phone>\d+)\).*Fee was: (?P<xfer_fee>\d+(?:,\d+)*) RWF.*New balance: (?P<xfer_balance>\d+(?:,\d+)*) RWF", re.ASCII)
+PAYMENT_RE = re.compile(r"TxId:\s*(?P<pay_txid>\d+).*Your payment of (?P<pay_amount>\d+(?:,\d+)*) RWF to (?P<pay_receiver>[^0-9]+)\s*\d+.*Your new balance:\s*(?P<pay_balance>\d+(?:,\d+)*) RWF.*Fee was (?P<pay_fee>\d+) RWF", re.ASCII)
+DEPOSIT_RE = re.compile(r"A bank deposit of (?P<dep_amount>\d+(?:,\d+)*) RWF.*Your NEW BALANCE\s*:(?P<dep_balance>\d+(?:,\d+)*) RWF", re.ASCII)
+DIRECT_PAYMENT_RE = re.compile(r"A transaction of (?P<direct_amount>\d+(?:,\d+)*) RWF by (?P<direct_receiver>[^o]+) on.*Your new balance:(?P<direct_balance>\d+(?:,\d+)*) RWF.*Fee was (?P<direct_fee>\d+) RWF.*Transaction Id: (?P<direct_txid>\d+)", re.ASCII)
+TXID_RE = re.compile(r'TxId:\s*(\d+)', re.ASCII)
+
+# All five patterns as one alternation, so each body is searched once instead
+# of up to five times. match.lastgroup names the pattern that matched. The
+# message formats don't overlap; if a body ever matched two, the match that
+# starts first wins.
+_BODY_PATTERNS = (
+    ("received", RECEIVED_RE),
+    ("transfer", TRANSFER_RE),
+    ("payment", PAYMENT_RE),
+    ("deposit", DEPOSIT_RE),
+    ("direct_payment", DIRECT_PAYMENT_RE),
+)
+BODY_RE = re.compile("|".join(f"(?P<{name}>{regex.pattern})" for name, regex in _BODY_PATTERNS), re.ASCII)
+
+
+def parse_xml_file(xml_path: Path, workers: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Parse XML file and extract transaction records
     
     Args:
         xml_path: Path to the XML file
+        workers: Number of processes to parse SMS bodies with. Only worth it
+            for very large exports - starting the processes costs more than
+            parsing a few thousand messages in this one.
         
     Returns:
         List of dictionaries containing transaction data
     """
-    transactions = []
-    
-    # Parse the XML file
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-    
     print(f"📄 Parsing XML file: {xml_path.name}")
-    print(f"   Total SMS count: {root.get('count', 'unknown')}")
     
-    # Extract SMS messages
-    for idx, sms in enumerate(root.findall('sms'), start=1):
-        body = sms.get('body', '')
-        date_timestamp = sms.get('date', '')
-        readable_date = sms.get('readable_date', '')
-        
-        # Parse transaction details from body text
-        transaction = parse_transaction_body(body, idx, date_timestamp, readable_date)
-        
-        if transaction:
-            transactions.append(transaction)
+    # Stream the file one <sms> at a time instead of building the whole tree.
+    # Everything we need is in <sms> attributes, so the whitespace between
+    # messages, comments and entity expansion are all skipped.
+    context = ET.iterparse(
+        str(xml_path),
+        events=('end',),
+        tag='sms',
+        remove_blank_text=True,
+        remove_comments=True,
+        remove_pis=True,
+        resolve_entities=False,
+    )
+    rows = _sms_rows(context)
+    
+    if workers and workers > 1:
+        transactions = [transaction for transaction in _parse_parallel(rows, workers) if transaction]
+    else:
+        transactions = []
+        for row in rows:
+            # Parse transaction details from body text
+            transaction = parse_transaction_body(*row)
+            
+            if transaction:
+                transactions.append(transaction)
     
+    print(f"   Total SMS count: {context.root.get('count', 'unknown')}")
     print(f"✅ Successfully parsed {len(transactions)} transactions\n")
     return transactions
 
 
+def _sms_rows(context) -> Iterator[Tuple[str, int, str, str]]:
+    """Yield parse_transaction_body's arguments for each <sms> in the stream"""
+    # Extract SMS messages
+    for idx, (_, sms) in enumerate(context, start=1):
+        yield sms.get('body', ''), idx, sms.get('date', ''), sms.get('readable_date', '')
+        
+        # Done with this <sms>: free it, and drop it and any earlier
+        # siblings from the root so memory stays flat
+        sms.clear()
+        while sms.getprevious() is not None:
+            del sms.getparent()[0]
+
+
+def _parse_parallel(rows: Iterable[Tuple[str, int, str, str]], workers: int) -> Iterator[Dict[str, Any]]:
+    """Parse rows on a process pool, yielding transactions in input order"""
+    # Bodies go to the workers in batches so each task is worth the IPC. Only
+    # 2 * workers batches are in flight at once, so the XML keeps streaming
+    # instead of every row being read and queued up front.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for batch in _batched(rows, PARALLEL_BATCH_SIZE):
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+            pending.append(pool.submit(_parse_batch, batch))
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _batched(rows: Iterable, size: int) -> Iterator[list]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _parse_batch(rows: List[Tuple[str, int, str, str]]) -> List[Dict[str, Any]]:
+    # Runs in a worker process
+    return [parse_transaction_body(*row) for row in rows]
+
+
+def _fill_received(transaction: Dict[str, Any], match: re.Match) -> None:
+    """Pattern 1: Received money"""
+    transaction["type"] = "RECEIVED"
+    transaction["amount"] = float(match["recv_amount"].replace(',', ''))
+    transaction["sender"] = match["recv_sender"].strip()
+    transaction["receiver"] = "You"
+    transaction["balance"] = float(match["recv_balance"].replace(',', ''))
+    transaction["transaction_id_external"] = match["recv_txid"]
+
+
+def _fill_transfer(transaction: Dict[str, Any], match: re.Match) -> None:
+    """Pattern 2: Sent/Transferred money"""
+    transaction["type"] = "SENT"
+    transaction["amount"] = float(match["xfer_amount"].replace(',', ''))
+    transaction["receiver"] = match["xfer_receiver"].strip()
+    transaction["fee"] = float(match["xfer_fee"].replace(',', ''))
+    transaction["balance"] = float(match["xfer_balance"].replace(',', ''))
+    transaction["sender"] = "You"
+    # Extract TxId if present
+    txid_match = TXID_RE.search(match.string)
+    if txid_match:
+        transaction["transaction_id_external"] = txid_match.group(1)
+
+
+def _fill_payment(transaction: Dict[str, Any], match: re.Match) -> None:
+    """Pattern 3: Payment to merchant/agent"""
+    transaction["type"] = "PAYMENT"
+    transaction["transaction_id_external"] = match["pay_txid"]
+    transaction["amount"] = float(match["pay_amount"].replace(',', ''))
+    transaction["receiver"] = match["pay_receiver"].strip()
+    transaction["sender"] = "You"
+    transaction["balance"] = float(match["pay_balance"].replace(',', ''))
+    transaction["fee"] = float(match["pay_fee"])
+
+
+def _fill_deposit(transaction: Dict[str, Any], match: re.Match) -> None:
+    """Pattern 4: Bank deposit"""
+    transaction["type"] = "BANK_DEPOSIT"
+    transaction["amount"] = float(match["dep_amount"].replace(',', ''))
+    transaction["balance"] = float(match["dep_balance"].replace(',', ''))
+    transaction["sender"] = "Bank"
+    transaction["receiver"] = "You"
+
+
+def _fill_direct_payment(transaction: Dict[str, Any], match: re.Match) -> None:
+    """Pattern 5: Direct payment debit"""
+    transaction["type"] = "DIRECT_PAYMENT"
+    transaction["amount"] = float(match["direct_amount"].replace(',', ''))
+    transaction["receiver"] = match["direct_receiver"].strip()
+    transaction["sender"] = "You"
+    transaction["balance"] = float(match["direct_balance"].replace(',', ''))
+    transaction["fee"] = float(match["direct_fee"])
+    transaction["transaction_id_external"] = match["direct_txid"]
+
+
+# Every parsed transaction starts as a copy of this. Copying a ready-made dict
+# is cheaper than building the 11-key literal for each SMS, and keeps the key
+# order (and so the JSON output) the same.
+_TRANSACTION_TEMPLATE = {
+    "id": "",
+    "body": "",
+    "timestamp": "",
+    "readable_date": "",
+    "type": "UNKNOWN",
+    "amount": 0.0,
+    "fee": 0.0,
+    "balance": 0.0,
+    "sender": "",
+    "receiver": "",
+    "transaction_id_external": ""
+}
+
+# BODY_RE group name -> function that copies that pattern's fields
+_FILLERS = {
+    "received": _fill_received,
+    "transfer": _fill_transfer,
+    "payment": _fill_payment,
+    "deposit": _fill_deposit,
+    "direct_payment": _fill_direct_payment,
+}
+
+
 def parse_transaction_body(body: str, transaction_id: int, timestamp: str, readable_date: str) -> Dict[str, Any]:
     """
     Extract transaction details from SMS body text using regex patterns
@@ -60,84 +223,29 @@ def parse_transaction_body(body: str, transaction_id: int, timestamp: str, reada
     Returns:
         Dictionary with transaction details
     """
-    transaction = {
-        "id": str(transaction_id),
-        "body": body,
-        "timestamp": timestamp,
-        "readable_date": readable_date,
-        "type": "UNKNOWN",
-        "amount": 0.0,
-        "fee": 0.0,
-        "balance": 0.0,
-        "sender": "",
-        "receiver": "",
-        "transaction_id_external": ""
-    }
-    
-    # Pattern 1: Received money
-    received_pattern = r"You have received (\d+(?:,\d+)*) RWF from ([^(]+)\s*\([^)]+\).*Your new balance:(\d+(?:,\d+)*) RWF.*Transaction Id: (\d+)"
-    received_match = re.search(received_pattern, body)
-    if received_match:
-        transaction["type"] = "RECEIVED"
-        transaction["amount"] = float(received_match.group(1).replace(',', ''))
-        transaction["sender"] = received_match.group(2).strip()
-        transaction["receiver"] = "You"
-        transaction["balance"] = float(received_match.group(3).replace(',', ''))
-        transaction["transaction_id_external"] = received_match.group(4)
-        return transaction
+    transaction = _TRANSACTION_TEMPLATE.copy()
+    transaction["id"] = str(transaction_id)
+    transaction["body"] = body
+    transaction["timestamp"] = timestamp
+    transaction["readable_date"] = readable_date
     
-    # Pattern 2: Sent/Transferred money
-    transfer_pattern = r"(\d+(?:,\d+)*) RWF transferred to ([^(]+)\s*\((\d+)\).*Fee was: (\d+(?:,\d+)*) RWF.*New balance: (\d+(?:,\d+)*) RWF"
-    transfer_match = re.search(transfer_pattern, body)
-    if transfer_match:
-        transaction["type"] = "SENT"
-        transaction["amount"] = float(transfer_match.group(1).replace(',', ''))
-        transaction["receiver"] = transfer_match.group(2).strip()
-        transaction["fee"] = float(transfer_match.group(4).replace(',', ''))
-        transaction["balance"] = float(transfer_match.group(5).replace(',', ''))
-        transaction["sender"] = "You"
-        return transaction
-    
-    # Pattern 3: Payment to merchant/agent
-    payment_pattern = r"TxId:\s*(\d+).*Your payment of (\d+(?:,\d+)*) RWF to ([^0-9]+)\s*\d+.*Your new balance:\s*(\d+(?:,\d+)*) RWF.*Fee was (\d+) RWF"
-    payment_match = re.search(payment_pattern, body)
-    if payment_match:
-        transaction["type"] = "PAYMENT"
-        transaction["transaction_id_external"] = payment_match.group(1)
-        transaction["amount"] = float(payment_match.group(2).replace(',', ''))
-        transaction["receiver"] = payment_match.group(3).strip()
-        transaction["sender"] = "You"
-        transaction["balance"] = float(payment_match.group(4).replace(',', ''))
-        transaction["fee"] = float(payment_match.group(5).replace(',', ''))
-        return transaction
-    
-    # Pattern 4: Bank deposit
-    deposit_pattern = r"A bank deposit of (\d+(?:,\d+)*) RWF.*Your NEW BALANCE\s*:(\d+(?:,\d+)*) RWF"
-    deposit_match = re.search(deposit_pattern, body)
-    if deposit_match:
-        transaction["type"] = "BANK_DEPOSIT"
-        transaction["amount"] = float(deposit_match.group(1).replace(',', ''))
-        transaction["balance"] = float(deposit_match.group(2).replace(',', ''))
-        transaction["sender"] = "Bank"
-        transaction["receiver"] = "You"
-        return transaction
-    
-    # Pattern 5: Direct payment debit
-    direct_payment_pattern = r"A transaction of (\d+(?:,\d+)*) RWF by ([^o]+) on.*Your new balance:(\d+(?:,\d+)*) RWF.*Fee was (\d+) RWF.*Transaction Id: (\d+)"
-    direct_payment_match = re.search(direct_payment_pattern, body)
-    if direct_payment_match:
-        transaction["type"] = "DIRECT_PAYMENT"
-        transaction["amount"] = float(direct_payment_match.group(1).replace(',', ''))
-        transaction["receiver"] = direct_payment_match.group(2).strip()
-        transaction["sender"] = "You"
-        transaction["balance"] = float(direct_payment_match.group(3).replace(',', ''))
-        transaction["fee"] = float(direct_payment_match.group(4).replace(',', ''))
-        transaction["transaction_id_external"] = direct_payment_match.group(5)
-        return transaction
+    transaction.update(_parse_body_fields(body))
     
     return transaction
 
 
+@lru_cache(maxsize=4096)
+def _parse_body_fields(body: str) -> Tuple[Tuple[str, Any], ...]:
+    # Fields the body text determines, as (key, value) pairs. Exports repeat
+    # the same body (notifications, promotions), so each distinct body only
+    # goes through the regex once; a tuple keeps the cached result immutable.
+    fields = {}
+    match = BODY_RE.search(body)
+    if match:
+        _FILLERS[match.lastgroup](fields, match)
+    return tuple(fields.items())
+
+
 def save_to_json(transactions: List[Dict[str, Any]], output_path: Path) -> None:
     """
     Save transactions to JSON file
@@ -148,8 +256,21 @@ def save_to_json(transactions: List[Dict[str, Any]], output_path: Path) -> None:
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(transactions, f, indent=2, ensure_ascii=False)
+    # Written one record at a time, so the whole file never has to sit in
+    # memory as one serialized blob. The output is byte-for-byte what
+    # orjson.dumps(transactions, option=OPT_INDENT_2) gives: each record is
+    # indented one level deeper to sit inside the array. Strings in JSON
+    # can't hold a raw newline, so every b"\n" is a line break.
+    with open(output_path, 'wb') as f:
+        if not transactions:
+            f.write(b"[]")
+        else:
+            separator = b"[\n  "
+            for transaction in transactions:
+                f.write(separator)
+                f.write(orjson.dumps(transaction, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+                separator = b",\n  "
+            f.write(b"\n]")
     
     print(f"💾 Saved {len(transactions)} transactions to {output_path}\n")
 
@@ -2,25 +2,58 @@
 Database loading module for MySQL
 """
 
-import mysql.connector
 from mysql.connector import Error
-from typing import List, Dict, Any, Optional
+from mysql.connector.pooling import MySQLConnectionPool, PooledMySQLConnection
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+from itertools import islice
 import logging
+import os
 
 from etl.config import DB_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# Connections kept open by the pool create_connection draws from. The pool
+# opens all of them up front, and load_transactions only ever uses one
+POOL_SIZE = 1
 
-def create_connection() -> Optional[mysql.connector.MySQLConnection]:
+# Rows sent per executemany call in load_transactions
+BATCH_SIZE = 1000
+
+INSERT_TRANSACTION_SQL = (
+    "INSERT INTO TRANSACTION "
+    "(transaction_ID, transaction_date, amount, transaction_type, reference_code, message_body) "
+    "VALUES (%s, %s, %s, %s, %s, %s)"
+)
+
+
+# Built on first use, and again in any process that didn't build it (a forked
+# worker must not share the parent's sockets)
+_pool: Optional[MySQLConnectionPool] = None
+_pool_pid: Optional[int] = None
+
+
+def _get_pool() -> MySQLConnectionPool:
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        _pool = MySQLConnectionPool(pool_name=f"etl_{os.getpid()}", pool_size=POOL_SIZE, **DB_CONFIG)
+        _pool_pid = os.getpid()
+    return _pool
+
+
+def create_connection() -> Optional[PooledMySQLConnection]:
     """
-    Create a database connection to MySQL database
+    Get a connection to the MySQL database from the connection pool
+    
+    Connections are reused between calls, so only the first few pay for
+    the TCP connect and login.
     
     Returns:
         Connection object or None if connection fails
     """
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
+        connection = _get_pool().get_connection()
         if connection.is_connected():
             logger.info(f"Successfully connected to MySQL database: {DB_CONFIG['database']}")
             return connection
@@ -29,26 +62,81 @@ def create_connection() -> Optional[mysql.connector.MySQLConnection]:
         return None
 
 
-def close_connection(conn: mysql.connector.MySQLConnection):
+def close_connection(conn: PooledMySQLConnection):
     """
-    Close database connection
+    Hand a database connection back to the pool
     
     Args:
         conn: Database connection
     """
     if conn and conn.is_connected():
+        # close() on a pooled connection returns it to the pool
         conn.close()
-        logger.info("MySQL connection closed")
+        logger.info("MySQL connection returned to pool")
 
 
-def load_transactions(transactions: List[Dict[str, Any]]):
+def load_transactions(transactions: List[Dict[str, Any]]) -> int:
     """
     Load multiple transactions into the MySQL database
     
+    Rows are sent with executemany in batches of BATCH_SIZE, so a load costs
+    one round trip per batch instead of one per transaction, and everything
+    is committed together at the end.
+    
+    Only the TRANSACTION table is filled. The USER and CATEGORY tables from
+    database/database_setup.sql, and the links to them, are not loaded here.
+    
     Args:
         transactions: List of transaction dictionaries
+        
+    Returns:
+        Number of transactions inserted (0 if the load failed and was rolled back)
+    """
+    connection = create_connection()
+    if connection is None:
+        return 0
+    
+    cursor = None
+    loaded = 0
+    try:
+        cursor = connection.cursor()
+        rows = (row for row in map(_transaction_row, transactions) if row is not None)
+        while batch := list(islice(rows, BATCH_SIZE)):
+            cursor.executemany(INSERT_TRANSACTION_SQL, batch)
+            loaded += len(batch)
+        connection.commit()
+        logger.info(f"Loaded {loaded} transactions")
+    except Error as e:
+        connection.rollback()
+        logger.error(f"Error loading transactions, rolled back: {e}")
+        loaded = 0
+    finally:
+        if cursor is not None:
+            cursor.close()
+        close_connection(connection)
+    
+    return loaded
+
+
+def _transaction_row(transaction: Dict[str, Any]) -> Optional[Tuple]:
     """
-    # TODO: Implement loading logic with proper error handling
-    # This should insert data into TRANSACTION, USER, CATEGORY tables
-    # based on the schema in database/database_setup.sql
-    pass
+    Turn a parsed transaction into a row for INSERT_TRANSACTION_SQL
+    
+    Returns:
+        Tuple of column values, or None if the SMS has no usable date
+    """
+    try:
+        # SMS dates are milliseconds since the epoch
+        transaction_date = datetime.fromtimestamp(int(transaction['timestamp']) / 1000)
+    except (KeyError, TypeError, ValueError):
+        logger.warning(f"Skipping transaction {transaction.get('id')}: invalid timestamp")
+        return None
+    
+    return (
+        str(transaction['id']),
+        transaction_date,
+        transaction.get('amount', 0.0),
+        transaction.get('type'),
+        transaction.get('transaction_id_external') or None,
+        transaction.get('body'),
+    )
@@ -0,0 +1,64 @@
+"""
+Checks that the Starlette app (api/asgi.py) answers like api/app.py
+"""
+
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+import requests
+from starlette.testclient import TestClient
+
+from api.app import TransactionHandler
+from api.asgi import app
+from api.storage import storage
+
+AUTH = ("admin", "momosmsanalysis")
+
+CASES = [
+    ("GET", "/transactions/1"),
+    ("GET", "/transactions/0"),
+    ("GET", "/transactions/-1"),
+    ("GET", "/transactions/abc"),
+    ("GET", "/transactions/"),
+    ("GET", "/transactions/1/"),
+    ("GET", "/nope"),
+    ("POST", "/transactions/1"),
+    ("PUT", "/transactions"),
+    ("DELETE", "/transactions/0"),
+    ("PATCH", "/transactions/1"),
+    ("HEAD", "/transactions"),
+]
+
+
+@pytest.fixture(scope="module")
+def servers():
+    storage.load_transactions([{"id": 1, "type": "SENT", "amount": 100.0}])
+
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), TransactionHandler)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{http_server.server_port}", TestClient(app)
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+
+
+@pytest.mark.parametrize("method, path", CASES)
+def test_same_status_as_app(servers, method, path):
+    base_url, client = servers
+
+    expected = requests.request(method, base_url + path, auth=AUTH)
+    actual = client.request(method, path, auth=AUTH, follow_redirects=False)
+
+    assert actual.status_code == expected.status_code
+    if expected.headers.get("Content-Type") == "application/json" and expected.content:
+        assert actual.json() == expected.json()
+
+
+def test_unsupported_method_beats_auth(servers):
+    base_url, client = servers
+
+    assert requests.request("PATCH", base_url + "/transactions").status_code == 501
+    assert client.request("PATCH", "/transactions").status_code == 501
@@ -0,0 +1,92 @@
+"""
+Unit tests for the API's in-memory transaction storage
+"""
+
+import pytest
+
+from api.storage import TransactionStorage
+
+
+def test_failed_update_keeps_transaction_indexed():
+    store = TransactionStorage()
+    store.load_transactions([{"id": 1, "type": "SENT", "amount": 100.0}])
+    assert [t["id"] for t in store.search_by_field("type", "SENT")] == [1]
+
+    # A JSON array body isn't a valid update
+    with pytest.raises((TypeError, ValueError)):
+        store.update(1, [1, 2])
+
+    assert store.get_by_id(1) is not None
+    assert [t["id"] for t in store.search_by_field("type", "SENT")] == [1]
+
+
+def test_get_all_limit_past_the_end_returns_everything():
+    store = TransactionStorage()
+    store.load_transactions([{"id": i, "type": "SENT", "amount": 1.0} for i in (1, 2, 3)])
+
+    assert [t["id"] for t in store.get_all(2)] == [1, 2]
+    # Bigger than sys.maxsize, which islice alone would reject
+    assert len(store.get_all(10 ** 20)) == 3
+
+
+def _ids(transactions):
+    return [t["id"] for t in transactions]
+
+
+def _loaded_store():
+    store = TransactionStorage()
+    store.load_transactions([
+        {"id": 1, "type": "SENT", "amount": 10.0},
+        {"id": 2, "type": "RECEIVED", "amount": 20.0},
+        {"id": 3, "type": "SENT", "amount": 30.0},
+        {"id": 4, "type": "RECEIVED", "amount": 40.0},
+    ])
+    # Build the index before the changes below
+    assert _ids(store.search_by_field("type", "SENT")) == [1, 3]
+    return store
+
+
+def test_search_after_load():
+    store = _loaded_store()
+    store.load_transactions([{"id": 5, "type": "SENT", "amount": 50.0}])
+
+    assert _ids(store.search_by_field("type", "SENT")) == [1, 3, 5]
+    assert _ids(store.search_by_field("type", "RECEIVED")) == [2, 4]
+
+
+def test_search_after_add():
+    store = _loaded_store()
+    store.add({"type": "SENT", "amount": 50.0})
+
+    assert _ids(store.search_by_field("type", "SENT")) == [1, 3, 5]
+
+
+def test_search_after_add_replacing_existing_id():
+    store = _loaded_store()
+    store.add({"id": 1, "type": "SENT", "amount": 99.0})
+    store.add({"id": 2, "type": "SENT", "amount": 99.0})
+
+    assert _ids(store.search_by_field("type", "SENT")) == [1, 2, 3]
+    assert _ids(store.search_by_field("type", "RECEIVED")) == [4]
+
+
+def test_search_after_update_keeps_storage_order():
+    store = _loaded_store()
+    # Same type: the record stays where it was
+    store.update(1, {"amount": 15.0})
+    assert _ids(store.search_by_field("type", "SENT")) == [1, 3]
+
+    # New type: the record joins the other bucket at its storage position
+    store.update(4, {"type": "SENT"})
+    store.update(2, {"type": "SENT"})
+    assert _ids(store.search_by_field("type", "SENT")) == _ids(store.get_all()) == [1, 2, 3, 4]
+    assert store.search_by_field("type", "RECEIVED") == []
+
+
+def test_search_after_delete():
+    store = _loaded_store()
+    store.delete(1)
+    store.delete("4")
+
+    assert _ids(store.search_by_field("type", "SENT")) == [3]
+    assert _ids(store.search_by_field("type", "RECEIVED")) == [2]